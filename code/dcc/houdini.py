@@ -42,6 +42,127 @@ def GetValueMightBeTimeVarying(attribute, checkVariability=False):
     return attribute.ValueMightBeTimeVarying()
 #// ANCHOR_END: houdiniTimeDependency
 
+#// ANCHOR: houdiniTimeDependencyBulk
+# We assume we are running with the function from the previous example.
+import os
+import tempfile
+import numpy as np
+import pxr
+from pxr import Sdf, Tf, Usd, UsdGeom
+
+def GetValuesMightBeTimeVarying(stage, checkVariability=False):
+    """Check which authored attributes on the stage have time samples.
+    This uses the same rules as GetValueMightBeTimeVarying: If the strongest property
+    spec is on an in-memory layer, a single time sample counts as time varying,
+    otherwise at least two time samples are needed.
+    Instead of querying each attribute, we resolve the prim stack and memoize the
+    result per prim spec, so that specs shared by multiple prims (e.g. via references)
+    are only inspected once.
+    Args:
+        stage (Usd.Stage): The stage.
+        checkVariability (bool): Preflight check if the time variability metadata is uniform,
+                                 if yes the attribute is classified as static.
+    Returns:
+        tuple(list, np.ndarray): The attribute paths and a bool array (True where the attribute is time varying).
+    """
+    # Memoized per layer: prim spec path -> {attribute name: time sample count}
+    # The count is 0 for static values and None if the spec has no value opinion (e.g. only metadata).
+    time_sample_counts_by_layer = {}
+    def get_prim_spec_time_sample_counts(prim_spec):
+        layer = prim_spec.layer
+        prim_spec_time_sample_counts = time_sample_counts_by_layer.setdefault(layer, {})
+        time_sample_counts = prim_spec_time_sample_counts.get(prim_spec.path)
+        if time_sample_counts is None:
+            time_sample_counts = prim_spec_time_sample_counts[prim_spec.path] = {}
+            for attr_spec in prim_spec.attributes:
+                if checkVariability and attr_spec.variability == Sdf.VariabilityUniform:
+                    time_sample_count = 0
+                else:
+                    time_sample_count = layer.GetNumTimeSamplesForPath(attr_spec.path)
+                    if not time_sample_count and not attr_spec.HasDefaultValue():
+                        time_sample_count = None
+                time_sample_counts[attr_spec.name] = time_sample_count
+        return time_sample_counts
+
+    attribute_paths = []
+    attribute_states = []
+    clip_root_prim_path = None
+    for prim in stage.Traverse(Usd.TraverseInstanceProxies(Usd.PrimDefaultPredicate)):
+        prim_path = prim.GetPath()
+        prim_stack = prim.GetPrimStack()
+        # Value clips are not included in the prim stack, they apply to all descendants.
+        if clip_root_prim_path and not prim_path.HasPrefix(clip_root_prim_path):
+            clip_root_prim_path = None
+        if not clip_root_prim_path and any(prim_spec.HasInfo("clips") for prim_spec in prim_stack):
+            clip_root_prim_path = prim_path
+        if clip_root_prim_path:
+            for attribute in prim.GetAuthoredAttributes():
+                attribute_paths.append(attribute.GetPath())
+                attribute_states.append(GetValueMightBeTimeVarying(attribute, checkVariability))
+            continue
+        # The stack is ordered strongest to weakest. The first spec with time samples
+        # or a default value provides the value, the first spec decides the threshold.
+        prim_time_sample_counts = {}
+        prim_time_sample_thresholds = {}
+        for prim_spec in prim_stack:
+            time_sample_threshold = 0 if prim_spec.layer.anonymous else 1
+            for attribute_name, time_sample_count in get_prim_spec_time_sample_counts(prim_spec).items():
+                prim_time_sample_thresholds.setdefault(attribute_name, time_sample_threshold)
+                if prim_time_sample_counts.get(attribute_name) is None:
+                    prim_time_sample_counts[attribute_name] = time_sample_count
+        for attribute_name, time_sample_count in prim_time_sample_counts.items():
+            attribute_paths.append(prim_path.AppendProperty(attribute_name))
+            attribute_states.append((time_sample_count or 0) > prim_time_sample_thresholds[attribute_name])
+    return attribute_paths, np.array(attribute_states, dtype=bool)
+
+### Run this on a plain stage (no Houdini needed) ###
+# An on disk asset with animated and static attributes, that is referenced multiple times.
+asset_layer = Sdf.Layer.CreateNew(os.path.join(tempfile.mkdtemp(), "asset.usdc"))
+asset_stage = Usd.Stage.Open(asset_layer)
+for idx in range(100):
+    mesh = UsdGeom.Mesh.Define(asset_stage, Sdf.Path(f"/asset/mesh_{idx}"))
+    mesh.GetFaceVertexCountsAttr().Set([4])
+    mesh.GetFaceVertexIndicesAttr().Set([0, 1, 2, 3])
+    mesh.GetDoubleSidedAttr().Set(True)
+    mesh.GetOrientationAttr().Set(UsdGeom.Tokens.rightHanded)
+    UsdGeom.PrimvarsAPI(mesh).CreatePrimvar("st", Sdf.ValueTypeNames.TexCoord2fArray).Set([(0, 0), (1, 0), (1, 1), (0, 1)])
+    # A single on disk time sample
+    mesh.GetVelocitiesAttr().Set([(0, 0, 0)] * 2, 1001)
+    for attr in (mesh.GetPointsAttr(), mesh.GetNormalsAttr(), mesh.GetExtentAttr()):
+        if idx % 2:
+            for frame in range(1001, 1011):
+                attr.Set([(frame, 0, 0)] * 2, frame)
+        else:
+            attr.Set([(0, 0, 0)] * 2)
+asset_stage.SetDefaultPrim(asset_stage.GetPrimAtPath("/asset"))
+asset_layer.Save()
+stage = Usd.Stage.CreateInMemory()
+for idx in range(100):
+    asset_prim = stage.DefinePrim(Sdf.Path(f"/set/asset_{idx}"))
+    asset_prim.GetReferences().AddReference(asset_layer.identifier)
+    # A single (in-memory) time sample override, e.g. from a live Houdini node
+    if idx % 10 == 0:
+        stage.GetPrimAtPath(asset_prim.GetPath().AppendChild("mesh_0")).GetAttribute("points").Set([(0, 0, 0)] * 2, 1001)
+    # A metadata only (in-memory) override over the single on disk time sample
+    if idx % 10 == 1:
+        stage.GetPrimAtPath(asset_prim.GetPath().AppendChild("mesh_0")).GetAttribute("velocities").SetDocumentation("Override")
+
+sw = Tf.Stopwatch()
+sw.Start()
+attributes = [a for p in stage.Traverse() for a in p.GetAuthoredAttributes()]
+states = [GetValueMightBeTimeVarying(a) for a in attributes]
+sw.Stop()
+print(sw.milliseconds) # Returns: 925
+sw.Reset()
+sw.Start()
+attribute_paths, attribute_states = GetValuesMightBeTimeVarying(stage)
+sw.Stop()
+print(sw.milliseconds) # Returns: 345
+states_by_path = dict(zip([a.GetPath() for a in attributes], states))
+print(all(states_by_path[p] == s for p, s in zip(attribute_paths, attribute_states))) # Returns: True
+print(len(attribute_paths), attribute_states.sum()) # Returns: 90000 15020
+#// ANCHOR_END: houdiniTimeDependencyBulk
+
 #// ANCHOR: houdiniFrustumCulling
 import numpy as np
 from pxr import Gf, Sdf, Usd, UsdGeom
@@ -164,6 +285,187 @@ if mode == "average" and data:
         visibility_attr.Set(UsdGeom.Tokens.inherited if any(visibility_data["visibility"]) else UsdGeom.Tokens.invisible)
 #// ANCHOR_END: houdiniFrustumCulling
 
+#// ANCHOR: houdiniFrustumCullingVectorized
+import numpy as np
+from pxr import Gf, Sdf, Tf, Usd, UsdGeom, Vt
+
+def compute_frustum_planes(frustum):
+    """Convert a frustum to plane equations.
+    Args:
+        frustum (Gf.Frustum): The (world space) frustum.
+    Returns:
+        np.ndarray: A (4 x 6) array of the left/right/bottom/top/near/far planes,
+                    a point p is inside a plane, if dot([p, 1], plane) >= 0.
+    """
+    # Gf uses row vectors, so the clip space planes are the matrix columns.
+    clip_matrix = np.array(frustum.ComputeViewMatrix()) @ np.array(frustum.ComputeProjectionMatrix())
+    x, y, z, w = clip_matrix.T
+    return np.stack([w + x, w - x, w + y, w - y, w + z, w - z], axis=1)
+
+def compute_point_instance_world_corners(instancer, bbox_cache, time_code):
+    """Compute the world space bbox corners of all instances.
+    Instead of computing a Gf.BBox3d per instance, we compute the bounds
+    per prototype and transform them with the instance transforms.
+    Args:
+        instancer (UsdGeom.PointInstancer): The point instancer.
+        bbox_cache (UsdGeom.BBoxCache): The bbox cache, set to the time code.
+        time_code (Usd.TimeCode): The time code.
+    Returns:
+        np.ndarray: A (instances x 8 x 3) array, instances of prototypes with empty bounds have NaN corners.
+    """
+    protoIndices = np.array(instancer.GetProtoIndicesAttr().Get(time_code), dtype=np.int64)
+    prototype_prim_paths = instancer.GetPrototypesRel().GetForwardedTargets()
+    if not len(protoIndices) or not prototype_prim_paths:
+        return np.empty((0, 8, 3))
+    stage = instancer.GetPrim().GetStage()
+    # Prototype corners (The prototype root xform is included in the instance transforms)
+    prototype_corners = np.zeros((len(prototype_prim_paths), 8, 4))
+    for prototype_idx, prototype_prim_path in enumerate(prototype_prim_paths):
+        bbox = bbox_cache.ComputeUntransformedBound(stage.GetPrimAtPath(prototype_prim_path))
+        bbox_range = bbox.GetRange()
+        if bbox_range.IsEmpty():
+            # Prototypes without bounds are never visible, their
+            # corners are set to NaN, so that they always get culled.
+            prototype_corners[prototype_idx] = np.nan
+            continue
+        bbox_matrix = np.array(bbox.GetMatrix())
+        corners = np.array([list(bbox_range.GetCorner(idx)) + [1.0] for idx in range(8)])
+        prototype_corners[prototype_idx] = corners @ bbox_matrix
+    # Instance transforms
+    instance_xforms = np.array(instancer.ComputeInstanceTransformsAtTime(
+        time_code, time_code, UsdGeom.PointInstancer.IncludeProtoXform, UsdGeom.PointInstancer.IgnoreMask
+    ))
+    instancer_xform = np.array(instancer.ComputeLocalToWorldTransform(time_code))
+    world_xforms = instance_xforms @ instancer_xform
+    corners = prototype_corners[protoIndices] @ world_xforms
+    return corners[..., :3]
+
+def compute_frustum_culled_mask(corners, planes):
+    """Test all boxes against the frustum planes at once.
+    A box is culled, if all its corners are outside of the same plane.
+    Boxes with NaN corners (empty bounds) are always culled.
+    Args:
+        corners (np.ndarray): A (boxes x 8 x 3) array.
+        planes (np.ndarray): A (4 x 6) array.
+    Returns:
+        np.ndarray: A (boxes) bool array, True where the box is outside the frustum.
+    """
+    distances = corners @ planes[:3]
+    distances += planes[3]
+    return (distances.max(axis=1) < 0).any(axis=1) | np.isnan(distances[:, 0, 0])
+
+def compute_point_instancer_invisible_ids(instancer, frustum, bbox_cache, time_code):
+    """Compute the 'invisibleIds' attribute value for the given frustum.
+    Returns:
+        np.ndarray: The ids (or indices if no 'ids' attribute is authored) of culled instances.
+    """
+    corners = compute_point_instance_world_corners(instancer, bbox_cache, time_code)
+    culled_mask = compute_frustum_culled_mask(corners, compute_frustum_planes(frustum))
+    ids = instancer.GetIdsAttr().Get(time_code)
+    if ids is not None and len(ids) == len(culled_mask):
+        return np.array(ids, dtype=np.int64)[culled_mask]
+    return np.flatnonzero(culled_mask)
+
+### Run this on a plain stage (no Houdini needed) ###
+stage = Usd.Stage.CreateInMemory()
+camera = UsdGeom.Camera.Define(stage, Sdf.Path("/cameras/camera"))
+UsdGeom.Xformable(camera).AddTranslateOp().Set(Gf.Vec3d(0, 0, 50))
+instancer = UsdGeom.PointInstancer.Define(stage, Sdf.Path("/set/toys/instancer"))
+prototype_prim = stage.DefinePrim(instancer.GetPath().AppendChild("Prototypes").AppendChild("cube"), "Cube")
+instancer.GetPrototypesRel().SetTargets([prototype_prim.GetPath()])
+instance_count = 100000
+instancer.GetProtoIndicesAttr().Set(Vt.IntArray.FromNumpy(np.zeros(instance_count, dtype=np.int32)))
+instancer.GetPositionsAttr().Set(Vt.Vec3fArray.FromNumpy(
+    (np.random.rand(instance_count, 3).astype(np.float32) - 0.5) * 200))
+
+time_code = Usd.TimeCode(1001)
+frustum = camera.GetCamera(time_code).frustum
+bbox_cache = UsdGeom.BBoxCache(time_code, ["default", "render", "proxy", "guide"],
+                               useExtentsHint=False, ignoreVisibility=False)
+sw = Tf.Stopwatch()
+sw.Start()
+bboxes = bbox_cache.ComputePointInstanceWorldBounds(instancer, list(range(instance_count)))
+invisibleIds_loop = np.array([idx for idx, bbox in enumerate(bboxes) if not frustum.Intersects(bbox)])
+sw.Stop()
+print(sw.milliseconds) # Returns: 491
+sw.Reset()
+sw.Start()
+invisibleIds = compute_point_instancer_invisible_ids(instancer, frustum, bbox_cache, time_code)
+sw.Stop()
+print(sw.milliseconds) # Returns: 140
+print(np.array_equal(invisibleIds, invisibleIds_loop)) # Returns: True
+instancer.GetInvisibleIdsAttr().Set(Vt.Int64Array.FromNumpy(invisibleIds), time_code)
+#// ANCHOR_END: houdiniFrustumCullingVectorized
+
+#// ANCHOR: houdiniFrustumCullingFrameRange
+# We assume we are running with the functions from the previous example.
+import numpy as np
+from pxr import Gf, Sdf, Usd, UsdGeom, Vt
+
+def compute_point_instancer_invisible_ids_frame_range(instancer, camera, time_samples,
+                                                      purposes=("default", "render", "proxy", "guide")):
+    """Compute the 'invisibleIds' of instances that are outside the frustum on all frames.
+    The visibility is tracked per id (or per index if no 'ids' attribute is authored),
+    so this also works with changing point counts. The memory stays proportional
+    to the unique id count instead of the frames x points count.
+    Args:
+        instancer (UsdGeom.PointInstancer): The point instancer.
+        camera (UsdGeom.Camera): The camera.
+        time_samples (list): The frames to sample.
+        purposes (tuple): The purposes to include in the bounds.
+    Returns:
+        np.ndarray: The sorted ids that are culled on all frames.
+    """
+    # Sorted unique ids and their visibility state
+    seen_ids = np.empty(0, dtype=np.int64)
+    seen_visible = np.empty(0, dtype=bool)
+    bbox_cache = UsdGeom.BBoxCache(Usd.TimeCode(time_samples[0]), list(purposes),
+                                   useExtentsHint=False, ignoreVisibility=False)
+    for time_sample in time_samples:
+        time_code = Usd.TimeCode(time_sample)
+        bbox_cache.SetTime(time_code)
+        frustum = camera.GetCamera(time_code).frustum
+        corners = compute_point_instance_world_corners(instancer, bbox_cache, time_code)
+        culled_mask = compute_frustum_culled_mask(corners, compute_frustum_planes(frustum))
+        ids = instancer.GetIdsAttr().Get(time_code)
+        if ids is not None and len(ids) == len(culled_mask):
+            ids = np.array(ids, dtype=np.int64)
+        else:
+            ids = np.arange(len(culled_mask), dtype=np.int64)
+        # Add new ids (sorted insert)
+        new_ids = np.setdiff1d(ids, seen_ids)
+        if len(new_ids):
+            insert_idx = np.searchsorted(seen_ids, new_ids)
+            seen_ids = np.insert(seen_ids, insert_idx, new_ids)
+            seen_visible = np.insert(seen_visible, insert_idx, False)
+        # Mark visible ids
+        seen_visible[np.searchsorted(seen_ids, ids[~culled_mask])] = True
+    return seen_ids[~seen_visible]
+
+### Run this on a plain stage (no Houdini needed) ###
+stage = Usd.Stage.CreateInMemory()
+camera = UsdGeom.Camera.Define(stage, Sdf.Path("/cameras/camera"))
+camera_translate_op = UsdGeom.Xformable(camera).AddTranslateOp()
+instancer = UsdGeom.PointInstancer.Define(stage, Sdf.Path("/set/toys/instancer"))
+prototype_prim = stage.DefinePrim(instancer.GetPath().AppendChild("Prototypes").AppendChild("cube"), "Cube")
+instancer.GetPrototypesRel().SetTargets([prototype_prim.GetPath()])
+time_samples = list(range(1001, 1011))
+# Points die and get born, so the point count and order changes per frame.
+rng = np.random.default_rng(0)
+positions = (rng.random((20000, 3), dtype=np.float32) - 0.5) * 100
+for time_sample in time_samples:
+    camera_translate_op.Set(Gf.Vec3d((time_sample - 1001) * 2, 0, 50), time_sample)
+    ids = np.sort(rng.choice(len(positions), 15000, replace=False))[::-1]
+    instancer.GetIdsAttr().Set(Vt.Int64Array.FromNumpy(ids), time_sample)
+    instancer.GetProtoIndicesAttr().Set(Vt.IntArray.FromNumpy(np.zeros(len(ids), dtype=np.int32)), time_sample)
+    instancer.GetPositionsAttr().Set(Vt.Vec3fArray.FromNumpy(positions[ids]), time_sample)
+
+invisibleIds = compute_point_instancer_invisible_ids_frame_range(instancer, camera, time_samples)
+# Write a single (non time sampled) sparse result
+instancer.GetInvisibleIdsAttr().Set(Vt.Int64Array.FromNumpy(invisibleIds))
+print(len(invisibleIds)) # Returns: 18336
+#// ANCHOR_END: houdiniFrustumCullingFrameRange
+
 #// ANCHOR: houdiniPointsNativeStream
 import numpy as np
 from pxr import UsdGeom
@@ -204,6 +506,137 @@ if extent_value:
     extent_attr.Set(extent_value, frame)
 #// ANCHOR_END: houdiniPointsNativeStream
 
+#// ANCHOR: houdiniPointsNativeStreamBatched
+import abc
+import numpy as np
+from pxr import Sdf, Usd, UsdGeom, Vt
+
+class PointGeometrySource(abc.ABC):
+    """The interface the point importer reads from.
+    Subclasses have to implement all abstract methods.
+    """
+    @abc.abstractmethod
+    def point_attrib_names(self):
+        """
+        Returns:
+            list: The point attribute names.
+        """
+    @abc.abstractmethod
+    def point_attrib_buffer(self, name):
+        """
+        Args:
+            name (str): The point attribute name.
+        Returns:
+            np.ndarray: A (points x tuple size) array in the attribute's native data type.
+        """
+
+class HoudiniPointGeometrySource(PointGeometrySource):
+    def __init__(self, sop_geo):
+        self.sop_geo = sop_geo
+    def point_attrib_names(self):
+        return [sop_attr.name() for sop_attr in self.sop_geo.pointAttribs()]
+    def point_attrib_buffer(self, name):
+        sop_attr = self.sop_geo.findPointAttrib(name)
+        # Read int attributes as ints instead of re-interpreting float data.
+        if sop_attr.dataType() == hou.attribData.Int:
+            data = self.sop_geo.pointIntAttribValuesAsString(name, int_type=hou.numericData.Int32)
+            value = np.frombuffer(data, dtype=np.int32)
+        else:
+            data = self.sop_geo.pointFloatAttribValuesAsString(name, float_type=hou.numericData.Float32)
+            value = np.frombuffer(data, dtype=np.float32)
+        return value.reshape(-1, sop_attr.size())
+
+class InMemoryPointGeometrySource(PointGeometrySource):
+    """A stand-in for testing without Houdini."""
+    def __init__(self, attributes):
+        self.attributes = attributes
+    def point_attrib_names(self):
+        return list(self.attributes.keys())
+    def point_attrib_buffer(self, name):
+        value = np.asarray(self.attributes[name])
+        return value.reshape(len(value), -1)
+
+ATTRIBUTE_MAPPING = {
+    "P": ("points", Sdf.ValueTypeNames.Point3fArray),
+    "id": ("ids", Sdf.ValueTypeNames.Int64Array),
+    "pscale": ("widths", Sdf.ValueTypeNames.FloatArray),
+    "Cd": ("primvars:displayColor", Sdf.ValueTypeNames.Color3fArray),
+}
+
+def stream_points(geometry_source, layer, prim_path, frame, attribute_mapping=ATTRIBUTE_MAPPING):
+    """Write the mapped point attributes of a geometry source to a Points prim.
+    All edits are done via the Sdf API in a single change block,
+    the extent is computed directly from the position and width buffers
+    (like UsdGeom.Points.ComputeExtent, each point is padded by half its width).
+    Args:
+        geometry_source (PointGeometrySource): The geometry source.
+        layer (Sdf.Layer): The layer to write to.
+        prim_path (Sdf.Path): The Points prim path.
+        frame (float): The frame to write the time samples at.
+        attribute_mapping (dict): The source name to (property name, value type name) mapping.
+    """
+    with Sdf.ChangeBlock():
+        prim_spec = Sdf.CreatePrimInLayer(layer, prim_path)
+        prim_spec.specifier = Sdf.SpecifierDef
+        prim_spec.typeName = "Points"
+        positions = None
+        widths = None
+        for source_name in geometry_source.point_attrib_names():
+            if source_name not in attribute_mapping:
+                continue
+            attr_name, attr_type_name = attribute_mapping[source_name]
+            value = geometry_source.point_attrib_buffer(source_name)
+            if attr_name == UsdGeom.Tokens.points:
+                positions = value
+            elif attr_name == UsdGeom.Tokens.widths:
+                widths = value
+            if value.shape[1] == 1:
+                value = value[:, 0]
+            attr_spec = prim_spec.attributes.get(attr_name)
+            if not attr_spec:
+                attr_spec = Sdf.AttributeSpec(prim_spec, attr_name, attr_type_name)
+                # Enforce "vertex" (Houdini speak "Point") interpolation
+                attr_spec.SetInfo(UsdGeom.Tokens.interpolation, UsdGeom.Tokens.vertex)
+            layer.SetTimeSample(attr_spec.path, frame, attr_type_name.type.pythonClass.FromNumpy(value))
+        if positions is not None and len(positions):
+            extent_attr_spec = prim_spec.attributes.get(UsdGeom.Tokens.extent)
+            if not extent_attr_spec:
+                extent_attr_spec = Sdf.AttributeSpec(prim_spec, UsdGeom.Tokens.extent, Sdf.ValueTypeNames.Float3Array)
+            # Reducing over contiguous per axis rows is a lot faster than positions.min(axis=0).
+            positions_per_axis = np.ascontiguousarray(positions.T, dtype=np.float32)
+            if widths is not None and len(widths) == len(positions):
+                half_widths = widths[:, 0].astype(np.float32) * 0.5
+                extent = np.stack([(positions_per_axis - half_widths).min(axis=1),
+                                   (positions_per_axis + half_widths).max(axis=1)])
+            else:
+                extent = np.stack([positions_per_axis.min(axis=1), positions_per_axis.max(axis=1)])
+            layer.SetTimeSample(extent_attr_spec.path, frame, Vt.Vec3fArray.FromNumpy(extent))
+
+### Run this on a Houdini Python LOP ###
+# sop_node = node.parm("spare_input0").evalAsNode()
+# geometry_source = HoudiniPointGeometrySource(sop_node.geometry())
+# stream_points(geometry_source, stage.GetEditTarget().GetLayer(), Sdf.Path("/points"), hou.frame())
+
+### Run this on a plain stage (no Houdini needed) ###
+point_count = 1000000
+geometry_source = InMemoryPointGeometrySource({
+    "P": np.random.rand(point_count, 3).astype(np.float32),
+    "id": np.arange(point_count, dtype=np.int32),
+    "pscale": np.random.rand(point_count).astype(np.float32) * 2,
+    "Cd": np.random.rand(point_count, 3).astype(np.float32),
+})
+stage = Usd.Stage.CreateInMemory()
+layer = stage.GetEditTarget().GetLayer()
+for frame in range(1001, 1011):
+    stream_points(geometry_source, layer, Sdf.Path("/points"), frame)
+points = UsdGeom.Points(stage.GetPrimAtPath("/points"))
+print(points.GetIdsAttr().Get(1001)[-1]) # Returns: 999999
+# The extent matches the extent computed by the UsdGeom.Points extent plugin.
+print(points.GetExtentAttr().Get(1001)) # Returns: [(-1, -1, -1), (2, 2, 2)] (roughly)
+print(UsdGeom.Boundable.ComputeExtentFromPlugins(points, 1001) == points.GetExtentAttr().Get(1001)) # Returns: True
+print(points.GetWidthsAttr().GetMetadata("interpolation")) # Returns: vertex
+#// ANCHOR_END: houdiniPointsNativeStreamBatched
+
 #// ANCHOR: houdiniPointInstancerReorderTracker
 import pxr
 node = hou.pwd()
@@ -363,6 +796,265 @@ def pointinstancer_prototypes_reorder(layers):
 pointinstancer_prototypes_reorder(layers)
 #// ANCHOR_END: houdiniPointInstancerReorderPostProcess
 
+#// ANCHOR: houdiniPointInstancerReorderPostProcessLUT
+import numpy as np
+from pxr import Sdf, Tf, UsdGeom, Vt
+
+def compute_prototype_remap_lut(source_prim_paths, destination_index_by_path, min_size=0):
+    """Build a lookup table that maps source prototype indices to destination prototype indices.
+    Args:
+        source_prim_paths (list): The prototype paths the protoIndices were written with.
+        destination_index_by_path (dict): The prototype path to destination index mapping.
+        min_size (int): The minimum table size, indices that are out of the
+                        source range are mapped to themselves.
+    Returns:
+        np.ndarray: The lookup table.
+    """
+    lut = np.arange(max(len(source_prim_paths), min_size), dtype=np.int32)
+    lut[:len(source_prim_paths)] = [destination_index_by_path[p] for p in source_prim_paths]
+    return lut
+
+def pointinstancer_protoIndices_remap(layer, instancer_prim_path, prototypes_prim_path_strs,
+                                      protoTracker_attr_name="protoTracker"):
+    """Remap all protoIndices time samples of an instancer to the given prototype order.
+    The time samples are matched by index (see pointinstancer_prototypes_reorder).
+    Args:
+        layer (Sdf.Layer): The layer.
+        instancer_prim_path (Sdf.Path): The instancer prim path.
+        prototypes_prim_path_strs (list): The (combined) prototype paths.
+        protoTracker_attr_name (str): The tracker attribute name.
+    Returns:
+        int: The number of remapped time samples.
+    """
+    protoTracker_attr_path = instancer_prim_path.AppendProperty(protoTracker_attr_name)
+    protoIndices_attr_path = instancer_prim_path.AppendProperty(UsdGeom.Tokens.protoIndices)
+    destination_index_by_path = {p: idx for idx, p in enumerate(prototypes_prim_path_strs)}
+    destination_value_tracker = Vt.StringArray(prototypes_prim_path_strs)
+    lut_cache = {}
+    remap_count = 0
+    with Sdf.ChangeBlock():
+        for protoTracker_time_sample, protoIndices_time_sample in zip(
+            layer.ListTimeSamplesForPath(protoTracker_attr_path),
+            layer.ListTimeSamplesForPath(protoIndices_attr_path)
+        ):
+            protoTracker_prim_paths = tuple(layer.QueryTimeSample(protoTracker_attr_path, protoTracker_time_sample))
+            # Skip if order already matches
+            if protoTracker_prim_paths == tuple(prototypes_prim_path_strs):
+                continue
+            source_value = np.asarray(layer.QueryTimeSample(protoIndices_attr_path, protoIndices_time_sample))
+            if not len(source_value):
+                continue
+            # The table only depends on the tracked order, which rarely changes per frame.
+            lut = lut_cache.get(protoTracker_prim_paths)
+            if lut is None or len(lut) <= source_value.max():
+                lut = compute_prototype_remap_lut(protoTracker_prim_paths, destination_index_by_path,
+                                                  min_size=source_value.max() + 1)
+                lut_cache[protoTracker_prim_paths] = lut
+            if source_value.min() < 0:
+                destination_value = np.where(source_value < 0, source_value, lut[np.maximum(source_value, 0)])
+            else:
+                destination_value = lut[source_value]
+            layer.SetTimeSample(protoIndices_attr_path, protoIndices_time_sample,
+                                Vt.IntArray.FromNumpy(destination_value))
+            # Update protoTracker attribute to reflect changes, allowing
+            # this function to be run multiple times.
+            layer.SetTimeSample(protoTracker_attr_path, protoTracker_time_sample, destination_value_tracker)
+            remap_count += 1
+    return remap_count
+
+def pointinstancer_prototypes_reorder_lut(layers, protoTracker_attr_name="protoTracker"):
+    """Same as pointinstancer_prototypes_reorder, but with lookup table based protoIndices remapping.
+    Args:
+        layers (list): A list of Sdf.Layer objects. It is up to the caller to
+                       call layer.Save() to commit the results of this function.
+    """
+    # Collect all point instancer prototypes
+    instancer_prototype_mapping = {}
+    for layer in layers:
+        def collect_data_layer_traverse(path):
+            if not path.IsPrimPropertyPath() or path.name != protoTracker_attr_name:
+                return
+            prototype_prim_paths = instancer_prototype_mapping.setdefault(path.GetPrimPath(), set())
+            for time_sample in layer.ListTimeSamplesForPath(path):
+                prototype_prim_paths.update(layer.QueryTimeSample(path, time_sample))
+        layer.Traverse(layer.pseudoRoot.path, collect_data_layer_traverse)
+    # Apply combined targets
+    for layer in layers:
+        for instancer_prim_path, prototype_prim_paths in instancer_prototype_mapping.items():
+            prototypes_prim_path_strs = sorted(prototype_prim_paths)
+            prototypes_rel_spec = layer.GetRelationshipAtPath(
+                instancer_prim_path.AppendProperty(UsdGeom.Tokens.prototypes)
+            )
+            if not prototypes_rel_spec:
+                continue
+            if not layer.GetAttributeAtPath(instancer_prim_path.AppendProperty(protoTracker_attr_name)):
+                continue
+            if not layer.GetAttributeAtPath(instancer_prim_path.AppendProperty(UsdGeom.Tokens.protoIndices)):
+                continue
+            prototypes_rel_spec.targetPathList.ClearEdits()
+            prototypes_rel_spec.targetPathList.explicitItems = [Sdf.Path(p) for p in prototypes_prim_path_strs]
+            pointinstancer_protoIndices_remap(layer, instancer_prim_path, prototypes_prim_path_strs,
+                                              protoTracker_attr_name)
+
+### Run this on a layer (no Houdini needed) ###
+def create_instancer_layer(prototype_count, instance_count, frames):
+    layer = Sdf.Layer.CreateAnonymous()
+    instancer_prim_spec = Sdf.CreatePrimInLayer(layer, Sdf.Path("/instancer"))
+    instancer_prim_spec.specifier = Sdf.SpecifierDef
+    instancer_prim_spec.typeName = "PointInstancer"
+    prototypes_rel_spec = Sdf.RelationshipSpec(instancer_prim_spec, UsdGeom.Tokens.prototypes)
+    protoIndices_attr_spec = Sdf.AttributeSpec(instancer_prim_spec, UsdGeom.Tokens.protoIndices, Sdf.ValueTypeNames.IntArray)
+    protoTracker_attr_spec = Sdf.AttributeSpec(instancer_prim_spec, "protoTracker", Sdf.ValueTypeNames.StringArray)
+    prototype_prim_paths = [f"/instancer/Prototypes/proto_{idx}" for idx in range(prototype_count)]
+    prototypes_rel_spec.targetPathList.explicitItems = [Sdf.Path(p) for p in prototype_prim_paths]
+    rng = np.random.default_rng(0)
+    for frame in frames:
+        layer.SetTimeSample(protoTracker_attr_spec.path, frame, Vt.StringArray(rng.permutation(prototype_prim_paths).tolist()))
+        layer.SetTimeSample(protoIndices_attr_spec.path, frame,
+                            Vt.IntArray.FromNumpy(rng.integers(0, prototype_count, instance_count, dtype=np.int32)))
+    return layer
+
+layer = create_instancer_layer(prototype_count=2000, instance_count=1000000, frames=range(1001, 1006))
+protoIndices_attr_path = Sdf.Path("/instancer.protoIndices")
+protoTracker_attr_path = Sdf.Path("/instancer.protoTracker")
+# Expected value: The path each instance pointed to before the reorder
+instance_prim_paths = np.array(layer.QueryTimeSample(protoTracker_attr_path, 1001))[
+    np.asarray(layer.QueryTimeSample(protoIndices_attr_path, 1001))]
+sw = Tf.Stopwatch()
+sw.Start()
+pointinstancer_prototypes_reorder_lut([layer])
+sw.Stop()
+# With pointinstancer_prototypes_reorder this takes 20528 ms.
+print(sw.milliseconds) # Returns: 163
+remapped_instance_prim_paths = np.array(layer.QueryTimeSample(protoTracker_attr_path, 1001))[
+    np.asarray(layer.QueryTimeSample(protoIndices_attr_path, 1001))]
+print(np.array_equal(instance_prim_paths, remapped_instance_prim_paths)) # Returns: True
+#// ANCHOR_END: houdiniPointInstancerReorderPostProcessLUT
+
+#// ANCHOR: houdiniPointInstancerReorderPostProcessParallel
+# We assume we are running with the functions from the previous example.
+import multiprocessing
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+from pxr import Sdf, Tf, UsdGeom
+
+def collect_protoTracker_prototypes(layer_file_path, protoTracker_attr_name="protoTracker"):
+    """Collect the tracked prototype paths per instancer of a layer file.
+    Returns:
+        dict: The instancer prim path (str) to prototype prim paths (set) mapping.
+    """
+    layer = Sdf.Layer.FindOrOpen(layer_file_path)
+    instancer_prototype_mapping = {}
+    def collect_data_layer_traverse(path):
+        if not path.IsPrimPropertyPath() or path.name != protoTracker_attr_name:
+            return
+        prototype_prim_paths = instancer_prototype_mapping.setdefault(path.GetPrimPath().pathString, set())
+        for time_sample in layer.ListTimeSamplesForPath(path):
+            prototype_prim_paths.update(layer.QueryTimeSample(path, time_sample))
+    layer.Traverse(layer.pseudoRoot.path, collect_data_layer_traverse)
+    return instancer_prototype_mapping
+
+def reorder_layer_file(layer_file_path, instancer_prototype_mapping, protoTracker_attr_name="protoTracker"):
+    """Apply the combined prototype order to a layer file and save it.
+    Args:
+        layer_file_path (str): The layer file path.
+        instancer_prototype_mapping (dict): The instancer prim path (str) to sorted prototype prim paths (list) mapping.
+    Returns:
+        int: The number of remapped time samples.
+    """
+    layer = Sdf.Layer.FindOrOpen(layer_file_path)
+    remap_count = 0
+    for instancer_prim_path_str, prototypes_prim_path_strs in instancer_prototype_mapping.items():
+        instancer_prim_path = Sdf.Path(instancer_prim_path_str)
+        prototypes_rel_spec = layer.GetRelationshipAtPath(
+            instancer_prim_path.AppendProperty(UsdGeom.Tokens.prototypes)
+        )
+        if not prototypes_rel_spec:
+            continue
+        if not layer.GetAttributeAtPath(instancer_prim_path.AppendProperty(protoTracker_attr_name)):
+            continue
+        if not layer.GetAttributeAtPath(instancer_prim_path.AppendProperty(UsdGeom.Tokens.protoIndices)):
+            continue
+        prototypes_rel_spec.targetPathList.ClearEdits()
+        prototypes_rel_spec.targetPathList.explicitItems = [Sdf.Path(p) for p in prototypes_prim_path_strs]
+        remap_count += pointinstancer_protoIndices_remap(layer, instancer_prim_path, prototypes_prim_path_strs,
+                                                         protoTracker_attr_name)
+    if layer.dirty:
+        layer.Save()
+    return remap_count
+
+def pointinstancer_prototypes_reorder_parallel(layer_file_paths, protoTracker_attr_name="protoTracker",
+                                               max_workers=None):
+    """Same as pointinstancer_prototypes_reorder, but for layer files (e.g. per frame caches).
+    The layers are read concurrently, the prototype order is combined once and
+    the layers are then re-written in a (spawned) process pool, where each worker saves its own layer.
+    That way we never have to hold all layers in memory at once. Spawned workers need a plain
+    python executable, within Houdini (or with a single worker) the layers are therefore
+    re-written in the current process.
+    Args:
+        layer_file_paths (list): The layer file paths.
+        protoTracker_attr_name (str): The tracker attribute name.
+        max_workers (int|None): The worker count, defaults to the cpu count.
+    Returns:
+        int: The number of remapped time samples.
+    """
+    max_workers = max_workers or os.cpu_count()
+    # Collect
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        layer_mappings = list(executor.map(collect_protoTracker_prototypes, layer_file_paths,
+                                           [protoTracker_attr_name] * len(layer_file_paths)))
+    # Reduce
+    instancer_prototype_mapping = {}
+    for layer_mapping in layer_mappings:
+        for instancer_prim_path_str, prototype_prim_paths in layer_mapping.items():
+            instancer_prototype_mapping.setdefault(instancer_prim_path_str, set()).update(prototype_prim_paths)
+    if not instancer_prototype_mapping:
+        return 0
+    instancer_prototype_mapping = {k: sorted(v) for k, v in instancer_prototype_mapping.items()}
+    # Apply
+    args = (layer_file_paths, [instancer_prototype_mapping] * len(layer_file_paths),
+            [protoTracker_attr_name] * len(layer_file_paths))
+    # In Houdini sys.executable is the Houdini binary, which can't run the worker processes.
+    if max_workers == 1 or "hou" in sys.modules or not os.path.basename(sys.executable or "").lower().startswith("python"):
+        return sum(map(reorder_layer_file, *args))
+    # Forking a process with a loaded USD/Houdini session is not safe, so we spawn the workers.
+    mp_context = multiprocessing.get_context("spawn")
+    mp_context.set_executable(sys.executable)
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context) as executor:
+        return sum(executor.map(reorder_layer_file, *args))
+
+### Run this on layer files (no Houdini needed) ###
+if __name__ == "__main__":
+    def create_instancer_layer_files():
+        layer_dir_path = tempfile.mkdtemp()
+        layer_file_paths = []
+        for frame in range(1001, 1021):
+            layer = create_instancer_layer(prototype_count=500, instance_count=100000, frames=[frame])
+            layer_file_path = os.path.join(layer_dir_path, f"instancer.{frame}.usdc")
+            layer.Export(layer_file_path)
+            layer_file_paths.append(layer_file_path)
+        return layer_file_paths
+    sw = Tf.Stopwatch()
+    # Current process
+    layer_file_paths = create_instancer_layer_files()
+    sw.Start()
+    print(pointinstancer_prototypes_reorder_parallel(layer_file_paths, max_workers=1)) # Returns: 20
+    sw.Stop()
+    print(sw.milliseconds) # Returns: 210
+    sw.Reset()
+    # Process pool
+    layer_file_paths = create_instancer_layer_files()
+    sw.Start()
+    print(pointinstancer_prototypes_reorder_parallel(layer_file_paths, max_workers=4)) # Returns: 20
+    sw.Stop()
+    # Spawning the workers has a startup cost, on a single core machine the
+    # pool is therefore slower than re-writing the layers in the current process.
+    print(sw.milliseconds) # Returns: 2079
+#// ANCHOR_END: houdiniPointInstancerReorderPostProcessParallel
+
 #// ANCHOR: houdiniPointInstancerNativeStream
 import pxr
 node = hou.pwd()
@@ -414,4 +1106,136 @@ with pxr.Sdf.ChangeBlock():
 
     if not layer.Apply(edit):
         raise Exception("Failed to modify layer!")
-#// ANCHOR: houdiniPointInstancerNativeStream
\ No newline at end of file
+#// ANCHOR_END: houdiniPointInstancerNativeStream
+
+#// ANCHOR: houdiniPointInstancerNativeStreamBatched
+import numpy as np
+from pxr import Sdf, Tf, Usd, UsdGeom, Vt
+
+def find_points_prims(stage):
+    """Find all Points prims, without traversing below gprims.
+    Returns:
+        list: The Usd.Prim objects.
+    """
+    points_prims = []
+    iterator = iter(Usd.PrimRange(stage.GetPseudoRoot(), Usd.TraverseInstanceProxies(Usd.PrimAllPrimsPredicate)))
+    for prim in iterator:
+        if prim.IsA(UsdGeom.Gprim):
+            # Gprims should not have gprim descendants.
+            iterator.PruneChildren()
+            if prim.IsA(UsdGeom.Points):
+                points_prims.append(prim)
+    return points_prims
+
+def parse_protoHash(protoHash_value, prim_path):
+    """Parse the 'instancer path|prototype path' pairs of the given instancer.
+    Args:
+        protoHash_value (Vt.StringArray): The protoHash attribute value.
+        prim_path (Sdf.Path): The instancer prim path.
+    Returns:
+        list: The prototype paths (str).
+    """
+    # A single prefix match pass is faster than splitting every
+    # entry (or converting the array to a numpy string array).
+    prefix = prim_path.pathString + "|"
+    prefix_length = len(prefix)
+    return [p[prefix_length:] for p in protoHash_value if p.startswith(prefix)]
+
+def convert_points_to_pointinstancers(ref_stage, layer, time_code, frame, protoHash_cache):
+    """Convert Points prims (with protoTracker/protoHash attributes) to PointInstancers.
+    Args:
+        ref_stage (Usd.Stage): The stage to read from.
+        layer (Sdf.Layer): The layer to write to.
+        time_code (Usd.TimeCode): The time code to read at.
+        frame (float): The frame to write the protoTracker time sample at.
+        protoHash_cache (dict): The prim path to parsed protoHash data mapping, pass in the
+                                same dict on every frame to skip re-parsing unchanged values.
+    """
+    edit = Sdf.BatchNamespaceEdit()
+    with Sdf.ChangeBlock():
+        for prim in find_points_prims(ref_stage):
+            prim_path = prim.GetPath()
+            prim_spec = layer.GetPrimAtPath(prim_path)
+            if not prim_spec:
+                continue
+            # Prim
+            prim_spec.typeName = "PointInstancer"
+            Sdf.AttributeSpec(prim_spec, UsdGeom.Tokens.purpose, Sdf.ValueTypeNames.Token)
+            # Rels
+            protoTracker_attr = prim.GetAttribute("protoTracker")
+            protoHash_attr = prim.GetAttribute("protoHash")
+            if protoTracker_attr and protoTracker_attr.HasValue():
+                protoTracker_prim_paths = [Sdf.Path(p) for p in protoTracker_attr.Get(time_code)]
+                # Cleanup
+                edit.Add(prim_path.AppendProperty("protoTracker:indices"), Sdf.Path.emptyPath)
+                edit.Add(prim_path.AppendProperty("protoTracker:lengths"), Sdf.Path.emptyPath)
+            elif protoHash_attr and protoHash_attr.HasValue():
+                protoHash_value = protoHash_attr.Get(time_code)
+                cached_protoHash_value, protoTracker_prim_paths, protoTracker_value = protoHash_cache.get(
+                    prim_path, (None, None, None)
+                )
+                if cached_protoHash_value != protoHash_value:
+                    protoTracker_prim_path_strs = parse_protoHash(protoHash_value, prim_path)
+                    protoTracker_prim_paths = [Sdf.Path(p) for p in protoTracker_prim_path_strs]
+                    protoTracker_value = Vt.StringArray(protoTracker_prim_path_strs)
+                    protoHash_cache[prim_path] = (protoHash_value, protoTracker_prim_paths, protoTracker_value)
+                protoTracker_attr_spec = prim_spec.attributes.get("protoTracker")
+                if not protoTracker_attr_spec:
+                    protoTracker_attr_spec = Sdf.AttributeSpec(prim_spec, "protoTracker", Sdf.ValueTypeNames.StringArray)
+                layer.SetTimeSample(protoTracker_attr_spec.path, frame, protoTracker_value)
+                # Cleanup
+                edit.Add(prim_path.AppendProperty("protoHash"), Sdf.Path.emptyPath)
+                edit.Add(prim_path.AppendProperty("protoHash:indices"), Sdf.Path.emptyPath)
+                edit.Add(prim_path.AppendProperty("protoHash:lengths"), Sdf.Path.emptyPath)
+            else:
+                protoTracker_prim_paths = None
+            if protoTracker_prim_paths is not None:
+                prototypes_rel_spec = Sdf.RelationshipSpec(prim_spec, UsdGeom.Tokens.prototypes)
+                prototypes_rel_spec.targetPathList.explicitItems = protoTracker_prim_paths
+            # Children
+            Prototypes_prim_spec = Sdf.CreatePrimInLayer(layer, prim_path.AppendChild("Prototypes"))
+            Prototypes_prim_spec.typeName = "Scope"
+            Prototypes_prim_spec.specifier = Sdf.SpecifierDef
+            # Rename
+            edit.Add(prim_path.AppendProperty(UsdGeom.Tokens.points),
+                     prim_path.AppendProperty(UsdGeom.Tokens.positions))
+        # Only properties that exist in the layer can be removed/renamed.
+        edit = Sdf.BatchNamespaceEdit([e for e in edit.edits if layer.GetObjectAtPath(e.currentPath)])
+        if not layer.Apply(edit):
+            raise Exception("Failed to modify layer!")
+
+### Run this on a Houdini Python LOP ###
+# node = hou.pwd()
+# ref_node = node.parm("spare_input0").evalAsNode()
+# protoHash_cache = node.cachedUserData("protoHashCache") or {}
+# node.setCachedUserData("protoHashCache", protoHash_cache)
+# time_code = Usd.TimeCode.Default() if not ref_node.isTimeDependent() else Usd.TimeCode(hou.frame())
+# convert_points_to_pointinstancers(ref_node.stage(), node.editableLayer(), time_code, hou.frame(), protoHash_cache)
+
+### Run this on a plain stage (no Houdini needed) ###
+def create_stage(instancer_count, prototype_count, mesh_count):
+    stage = Usd.Stage.CreateInMemory()
+    for instancer_idx in range(instancer_count):
+        points = UsdGeom.Points.Define(stage, Sdf.Path(f"/set/instancer_{instancer_idx}"))
+        points.GetPointsAttr().Set(Vt.Vec3fArray.FromNumpy(np.random.rand(1000, 3).astype(np.float32)))
+        points.GetPrim().CreateAttribute("protoHash", Sdf.ValueTypeNames.StringArray).Set(
+            [f"/set/instancer_{instancer_idx}|/prototypes/proto_{idx}" for idx in range(prototype_count)]
+        )
+    for mesh_idx in range(mesh_count):
+        mesh = UsdGeom.Mesh.Define(stage, Sdf.Path(f"/geo/mesh_{mesh_idx}"))
+        UsdGeom.Subset.Define(stage, mesh.GetPath().AppendChild("subset"))
+    return stage
+
+protoHash_cache = {}
+sw = Tf.Stopwatch()
+for frame in (1001, 1002):
+    stage = create_stage(instancer_count=100, prototype_count=1000, mesh_count=10000)
+    sw.Reset()
+    sw.Start()
+    convert_points_to_pointinstancers(stage, stage.GetRootLayer(), Usd.TimeCode.Default(), frame, protoHash_cache)
+    sw.Stop()
+    print(sw.milliseconds) # Returns: 1001 -> 846, 1002 -> 491 (unchanged protoHash values are not re-parsed)
+instancer = UsdGeom.PointInstancer(stage.GetPrimAtPath("/set/instancer_0"))
+print(len(instancer.GetPositionsAttr().Get())) # Returns: 1000
+print(instancer.GetPrototypesRel().GetTargets()[1]) # Returns: /prototypes/proto_1
+#// ANCHOR_END: houdiniPointInstancerNativeStreamBatched
@@ -69,6 +69,232 @@ def Xform "basket_ball"
 """
 #// ANCHOR_END: productionConceptsSdfBatchNamespaceMoveRenameDelete
 
+#// ANCHOR: productionConceptsSdfBatchNamespaceEditPlanner
+import heapq
+import random
+from pxr import Sdf, Tf
+
+def plan_namespace_edits(layer, edits):
+    """Order and coalesce an unordered set of namespace edits into a single batch edit.
+    - Chained moves are merged (a -> b -> c becomes a -> c), if the intermediate
+      path (b) does not exist in the layer.
+    - Existing specs are moved/removed before other specs are moved into their place.
+    - Moves run parents before children, edits below moved parents are remapped.
+    - Moves out of removed prims run before the removal, edits that stay below
+      removed prims are dropped and moves into removed prims raise a ValueError.
+    Args:
+        layer (Sdf.Layer): The layer the edits are planned for.
+        edits (list[tuple(Sdf.Path, Sdf.Path)]): A list of (source, target) path pairs,
+            the target is Sdf.Path.emptyPath for removals. Paths refer to the layer
+            before the edit, except for sources that only exist after other moves.
+    Returns:
+        Sdf.BatchNamespaceEdit: The batch edit.
+    """
+    targets = {}
+    for source, target in edits:
+        source, target = Sdf.Path(source), Sdf.Path(target)
+        if targets.get(source, target) != target:
+            raise ValueError(f"Conflicting namespace edits for {source}: {targets[source]}, {target}")
+        targets[source] = target
+    # Merge chained moves
+    chained_sources = {target for target in targets.values()
+                       if target in targets and not layer.GetObjectAtPath(target)}
+    merged_sources = set()
+    merged_targets = {}
+    for source, target in targets.items():
+        if source in chained_sources:
+            continue
+        visited_paths = {source}
+        while target in chained_sources:
+            if target in visited_paths:
+                raise ValueError(f"Cyclic namespace edits starting at: {source}")
+            visited_paths.add(target)
+            merged_sources.add(target)
+            target = targets[target]
+        merged_targets[source] = target
+    if chained_sources - merged_sources:
+        raise ValueError(f"Cyclic namespace edits: {sorted(chained_sources - merged_sources)}")
+    # Resolve sources that only exist after other moves (e.g. properties of moved prims)
+    moved_from = {target: source for source, target in targets.items() if not target.isEmpty}
+    resolved_targets = {}
+    for source, target in merged_targets.items():
+        visited_paths = set()
+        while not layer.GetObjectAtPath(source) and source not in visited_paths:
+            visited_paths.add(source)
+            for prefix in reversed(source.GetPrefixes()[:-1]):
+                if prefix in moved_from:
+                    source = source.ReplacePrefix(prefix, moved_from[prefix])
+                    break
+        if resolved_targets.get(source, target) != target:
+            raise ValueError(f"Conflicting namespace edits for {source}: {resolved_targets[source]}, {target}")
+        resolved_targets[source] = target
+    # Drop edits that stay below removed paths
+    removed_paths = {source for source, target in resolved_targets.items() if target.isEmpty}
+    def is_removed(path):
+        return any(prefix in removed_paths for prefix in path.GetPrefixes()[:-1])
+    resolved_targets = {source: target for source, target in resolved_targets.items()
+                        if not is_removed(source) or not (target.isEmpty or is_removed(target))}
+    moved_to = {target: source for source, target in resolved_targets.items() if not target.isEmpty}
+    # Collect the edits each edit has to run after
+    dependencies = {source: set() for source in resolved_targets}
+    for source, target in resolved_targets.items():
+        for prefix in source.GetPrefixes()[:-1]:
+            if prefix not in resolved_targets:
+                continue
+            if resolved_targets[prefix].isEmpty:
+                # Move specs out of removed prims before the removal
+                dependencies[prefix].add(source)
+            else:
+                # Move parents before children
+                dependencies[source].add(prefix)
+        if target.isEmpty:
+            continue
+        # Move/remove existing specs before moving other specs into their place
+        if target in resolved_targets:
+            dependencies[source].add(target)
+        for prefix in reversed(target.GetPrefixes()[:-1]):
+            if prefix in moved_to:
+                # Move parents into place before moving children into them
+                dependencies[source].add(moved_to[prefix])
+                break
+            if prefix in removed_paths:
+                raise ValueError(f"Namespace edit target {target} is below the removed path {prefix}")
+    # Order the edits (parents first), so that they run after their dependencies
+    dependents = {source: [] for source in resolved_targets}
+    for source, source_dependencies in dependencies.items():
+        for dependency in source_dependencies:
+            dependents[dependency].append(source)
+    dependency_counts = {source: len(source_dependencies) for source, source_dependencies in dependencies.items()}
+    sources = list(resolved_targets)
+    source_indices = {source: idx for idx, source in enumerate(sources)}
+    queue = [(source.pathElementCount, source_indices[source]) for source, count in dependency_counts.items() if not count]
+    heapq.heapify(queue)
+    ordered_sources = []
+    while queue:
+        source = sources[heapq.heappop(queue)[1]]
+        ordered_sources.append(source)
+        for dependent in dependents[source]:
+            dependency_counts[dependent] -= 1
+            if not dependency_counts[dependent]:
+                heapq.heappush(queue, (dependent.pathElementCount, source_indices[dependent]))
+    if len(ordered_sources) != len(sources):
+        raise ValueError(f"Cyclic namespace edits: {sorted(s for s, c in dependency_counts.items() if c)[:10]}")
+    # Remap the paths below already moved parents
+    moved_paths = {}
+    def remap_path(path, is_target):
+        for prefix in reversed(path.GetPrefixes()[:-1]):
+            if is_target and prefix in moved_to:
+                break
+            moved_path = moved_paths.get(prefix)
+            if moved_path:
+                return path.ReplacePrefix(prefix, moved_path)
+        return path
+    edit = Sdf.BatchNamespaceEdit()
+    for source in ordered_sources:
+        target = resolved_targets[source]
+        if not target.isEmpty:
+            target = remap_path(target, is_target=True)
+            moved_paths[source] = target
+        edit.Add(remap_path(source, is_target=False), target)
+    return edit
+
+def apply_namespace_edits(layer, edits, batch_size=100):
+    """Plan, validate and apply namespace edits on a layer.
+    Sdf validates each edit of a batch against all previous edits of the batch,
+    so the cost of a single batch grows quadratically with the edit count.
+    We therefore apply the planned edits in batches. To still leave the layer
+    untouched when an edit fails, all batches are first validated and applied
+    on an anonymous copy of the layer, before they are applied on the layer.
+    Args:
+        layer (Sdf.Layer): The layer.
+        edits (list[tuple(Sdf.Path, Sdf.Path)]): See plan_namespace_edits.
+        batch_size (int): The edit count per batch.
+    """
+    namespace_edits = plan_namespace_edits(layer, edits).edits
+    batch_edits = []
+    for idx in range(0, len(namespace_edits), batch_size):
+        edit = Sdf.BatchNamespaceEdit()
+        for namespace_edit in namespace_edits[idx:idx + batch_size]:
+            edit.Add(namespace_edit)
+        batch_edits.append(edit)
+    # Validate
+    layer_copy = Sdf.Layer.CreateAnonymous()
+    layer_copy.TransferContent(layer)
+    for edit in batch_edits:
+        # This returns True or a (False, details) tuple.
+        result = layer_copy.CanApply(edit)
+        if result is not True:
+            raise Exception(f"Failed to apply layer edit: {result[1][:10]}")
+        layer_copy.Apply(edit)
+    # Apply
+    with Sdf.ChangeBlock():
+        for edit in batch_edits:
+            if not layer.Apply(edit):
+                raise Exception("Failed to apply layer edit!")
+
+### Run this on a layer with a lot of prims ###
+def create_layer():
+    layer = Sdf.Layer.CreateAnonymous()
+    with Sdf.ChangeBlock():
+        for group_idx in range(1000):
+            for prim_idx in range(100):
+                prim_spec = Sdf.CreatePrimInLayer(layer, Sdf.Path(f"/world/group_{group_idx}/prim_{prim_idx}"))
+                prim_spec.specifier = Sdf.SpecifierDef
+    return layer
+
+edits = []
+for group_idx in range(1000):
+    group_path = Sdf.Path(f"/world/group_{group_idx}")
+    if group_idx % 10 == 0:
+        # Removed groups (with edits below them, that should be dropped)
+        edits.append((group_path, Sdf.Path.emptyPath))
+    else:
+        # Chained renames
+        edits.append((group_path, group_path.ReplaceName(f"tmp_{group_idx}")))
+        edits.append((group_path.ReplaceName(f"tmp_{group_idx}"), group_path.ReplaceName(f"asset_{group_idx}")))
+    for prim_idx in range(100):
+        prim_path = group_path.AppendChild(f"prim_{prim_idx}")
+        if prim_idx % 2:
+            edits.append((prim_path, Sdf.Path.emptyPath))
+        else:
+            edits.append((prim_path, prim_path.ReplaceName(f"mesh_{prim_idx}")))
+random.seed(0)
+random.shuffle(edits)
+
+# The unordered edits can't be applied as is.
+sw = Tf.Stopwatch()
+### Sequential ###
+layer = create_layer()
+sw.Start()
+failed_edit_count = 0
+with Sdf.ChangeBlock():
+    for source, target in edits:
+        edit = Sdf.BatchNamespaceEdit()
+        edit.Add(source, target)
+        if layer.CanApply(edit) is not True:
+            failed_edit_count += 1
+            continue
+        layer.Apply(edit)
+sw.Stop()
+print(sw.milliseconds, failed_edit_count, len(edits)) # Returns: 11319 49645 101900
+sw.Reset()
+### Planned (Single batch) ###
+layer = create_layer()
+print(len(plan_namespace_edits(layer, edits).edits)) # Returns: 91000
+# Sdf validates each edit against all previous edits of the batch, so this takes ~14 minutes.
+# edit = plan_namespace_edits(layer, edits)
+# layer.CanApply(edit)
+# layer.Apply(edit)
+### Planned (Batched) ###
+layer = create_layer()
+sw.Start()
+apply_namespace_edits(layer, edits)
+sw.Stop()
+print(sw.milliseconds) # Returns: 13280
+print(layer.GetPrimAtPath("/world/asset_1/mesh_2")) # Returns: Sdf.Find('anon:...', '/world/asset_1/mesh_2')
+print(layer.GetPrimAtPath("/world/group_0")) # Returns: None
+#// ANCHOR_END: productionConceptsSdfBatchNamespaceEditPlanner
+
 
 #// ANCHOR: productionConceptsSdfBatchNamespaceEditVariant
 ### High Level / Low Level ###
@@ -1,3 +1,12 @@
+import ast
+import hashlib
+import multiprocessing
+import os
+import sys
+import textwrap
+import types
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 import pxr
 import numpy as np
 
@@ -15,18 +24,415 @@ class Binding():
         self.value_type_name = ""
 
 class Point():
-    def __init__(self, bindings):
-        self.ptnum = -1
+    """A view onto a single point of a PointBuffer.
+    The binding variables are exposed as properties (see get_point_class),
+    reading/writing them directly indexes into the buffer columns.
+    Kernels can still store scratch attributes on the point (via the __dict__ slot),
+    these are not written to the buffer.
+    """
+    __slots__ = ("buffer", "ptnum", "__dict__")
+    def __init__(self, buffer, ptnum):
+        self.buffer = buffer
+        self.ptnum = ptnum
+
+    @property
+    def bindings(self):
+        return self.buffer.bindings
+
+def point_attribute_property(property_name):
+    def getter(self):
+        return self.buffer.columns[property_name][self.ptnum]
+    def setter(self, value):
+        column = self.buffer.columns[property_name]
+        # Values like pscale can be of shape (1,), so we reshape to the element shape.
+        column[self.ptnum] = np.reshape(value, column.shape[1:])
+    return property(getter, setter)
+
+POINT_CLASS_CACHE = {}
+
+def get_point_class(bindings):
+    key = tuple((binding.variable_name, binding.property_name) for binding in bindings)
+    point_class = POINT_CLASS_CACHE.get(key)
+    if point_class is None:
+        attrs = {variable_name: point_attribute_property(property_name) for variable_name, property_name in key}
+        attrs["__slots__"] = ()
+        point_class = POINT_CLASS_CACHE[key] = type("Point", (Point,), attrs)
+    return point_class
+
+class PointBuffer():
+    """A struct-of-arrays point storage with one numpy column per binding.
+    Points are added with amortized growth and removed via a mask.
+    """
+    def __init__(self, bindings, columns, count=None):
+        """
+        Args:
+            bindings (list): The bindings.
+            columns (dict): The property name to array mapping, the arrays are used as is (no copy).
+            count (int|None): The used element count, defaults to the column length.
+        """
         self.bindings = bindings
-        for binding in self.bindings:
-            setattr(self, binding.variable_name, None)
-                
+        self.columns = columns
+        capacity = len(next(iter(columns.values()))) if columns else 0
+        self.count = capacity if count is None else count
+        self.removed = np.zeros(capacity, dtype=bool)
+        self.point_class = get_point_class(bindings)
+
+    @classmethod
+    def empty_like(cls, buffer, capacity=64):
+        columns = {name: np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+                   for name, column in buffer.columns.items()}
+        return cls(buffer.bindings, columns, count=0)
+
+    def view(self, ptnum):
+        return self.point_class(self, ptnum)
+
+    def add(self):
+        """Add a (zero initialized) point.
+        Returns:
+            int: The index of the added point.
+        """
+        capacity = len(self.removed)
+        if self.count == capacity:
+            capacity = max(capacity * 2, 64)
+            for name, column in self.columns.items():
+                grown_column = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+                grown_column[:self.count] = column[:self.count]
+                self.columns[name] = grown_column
+            self.removed = np.concatenate([self.removed, np.zeros(capacity - len(self.removed), dtype=bool)])
+        self.count += 1
+        return self.count - 1
+
+    def compact(self):
+        """Get the columns without removed points.
+        Returns:
+            dict: The property name to array mapping.
+        """
+        keep_mask = ~self.removed[:self.count]
+        return {name: column[:self.count][keep_mask] for name, column in self.columns.items()}
+
 class Points():
     def __init__(self):
         self.bindings = []
         for binding in self.bindings:
             setattr(self, binding.variable_name, [])
-          
+
+# The point count per chunk in "kernel" mode
+KERNEL_CHUNK_SIZE = 100000
+# Calls that work element wise on whole arrays, as long as
+# all arguments are either arrays or constants.
+VECTORIZABLE_FUNCTION_NAMES = ("abs",)
+VECTORIZABLE_NUMPY_FUNCTION_NAMES = ("where", "clip")
+
+class Kernel():
+    def __init__(self, mode, module_code, execute_code, bindings_serialized):
+        self.source = (mode, module_code, execute_code, bindings_serialized)
+        self.mode = mode
+        self.execute_code = execute_code
+        # Bindings
+        self.bindings = []
+        for binding_dict in eval(bindings_serialized):
+            binding = Binding()
+            binding.property_name = binding_dict["property_name"]
+            binding.variable_name = binding_dict["variable_name"]
+            binding.value_type_name = binding_dict["value_type_name"]
+            self.bindings.append(binding)
+        # The user code is wrapped into a function, this way it is only compiled once
+        # and runs with fast local variable lookups instead of an exec() per point.
+        # Module level names that the user code assigns are declared global,
+        # so that their state is kept across points (like with an exec() per point).
+        self.module_code_compiled = compile(module_code, "module_code", "exec")
+        self.global_names = sorted(get_assigned_names(execute_code) & set(self.module_code_compiled.co_names))
+        global_declaration = "    global {}\n".format(", ".join(self.global_names)) if self.global_names else ""
+        kernel_code = "def kernel(point=None, points=None, elemnum=-1):\n{}{}\n    pass\n".format(
+            global_declaration, textwrap.indent(execute_code, "    ")
+        )
+        self.kernel_code_compiled = compile(kernel_code, "code", "exec")
+        self.vectorizable = None
+        # The stage and prim are not available in worker processes and module level
+        # state can't be shared across them, so these kernels always run serially.
+        code_names = get_code_names(self.module_code_compiled) | get_code_names(self.kernel_code_compiled)
+        self.parallelizable = not self.global_names and not code_names & {"stage", "prim"}
+
+    def instantiate(self, kernel_globals):
+        """Run the module code and create the kernel function in the given globals.
+        Args:
+            kernel_globals (dict): The globals available to the user code.
+        Returns:
+            function: The kernel function.
+        """
+        exec(self.module_code_compiled, kernel_globals)
+        exec(self.kernel_code_compiled, kernel_globals)
+        if self.vectorizable is None:
+            # Kernels with module level state have to run per point.
+            self.vectorizable = not self.global_names and is_kernel_vectorizable(self.execute_code,
+                                                                                 kernel_globals, self.bindings)
+        return kernel_globals["kernel"]
+
+# Process wide cache of compiled kernels, this way we only
+# compile the code of prims whose kernel attributes changed.
+KERNEL_CACHE = {}
+KERNEL_CACHE_MAX_SIZE = 1000
+
+def get_kernel(prim, frame):
+    """Get the (cached) kernel of a prim.
+    Args:
+        prim (Usd.Prim): The prim with the vfxSurvivalGuide:attributeKernel:* attributes.
+        frame (float): The frame to read the attributes at.
+    Returns:
+        Kernel: The kernel.
+    """
+    source = tuple(prim.GetAttribute(name).Get(frame) or "" for name in
+                   (Tokens.mode, Tokens.module_code, Tokens.execute_code, Tokens.bindings))
+    return get_kernel_from_source(source)
+
+def get_kernel_from_source(source):
+    kernel_hash = hashlib.sha1("\0".join(source).encode("utf-8")).hexdigest()
+    kernel = KERNEL_CACHE.get(kernel_hash)
+    if kernel is None:
+        if len(KERNEL_CACHE) >= KERNEL_CACHE_MAX_SIZE:
+            KERNEL_CACHE.clear()
+        kernel = KERNEL_CACHE[kernel_hash] = Kernel(*source)
+    return kernel
+
+def get_code_names(code):
+    """Get the global/attribute names used by a code object, including nested code objects.
+    Args:
+        code (types.CodeType): The compiled code.
+    Returns:
+        set: The names.
+    """
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= get_code_names(const)
+    return names
+
+def get_assigned_names(code):
+    """Get the names the code assigns in its own scope (without nested functions/classes).
+    Args:
+        code (str): The source code.
+    Returns:
+        set: The assigned names, the kernel function arguments are excluded.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return set()
+    names = set()
+    nodes = list(tree.body)
+    while nodes:
+        node = nodes.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+            continue
+        if isinstance(node, (ast.Lambda, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)):
+            continue
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            names.add(node.id)
+        elif isinstance(node, ast.alias):
+            names.add((node.asname or node.name).split(".")[0])
+        nodes.extend(ast.iter_child_nodes(node))
+    return names - {"point", "points", "elemnum"}
+
+def is_kernel_vectorizable(execute_code, kernel_globals, bindings):
+    # A per point kernel can run on whole arrays, if it only does element wise math
+    # on the point attributes, without any control flow, indexing or point creation/removal.
+    try:
+        tree = ast.parse(execute_code)
+    except SyntaxError:
+        return False
+    point_attr_names = set([b.variable_name for b in bindings] + ["ptnum"])
+    local_names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    local_names.add(target.id)
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Module, ast.Expr, ast.Assign, ast.AugAssign, ast.BinOp, ast.UnaryOp,
+                             ast.Constant, ast.List, ast.Load, ast.Store, ast.operator, ast.unaryop,
+                             ast.cmpop)):
+            continue
+        if isinstance(node, ast.Compare):
+            if len(node.ops) > 1:
+                return False
+            continue
+        if isinstance(node, ast.Name):
+            if node.id in ("point", "elemnum", "np") or node.id in local_names:
+                continue
+            if isinstance(kernel_globals.get(node.id), (int, float, np.number)):
+                continue
+            return False
+        if isinstance(node, ast.Attribute):
+            if not isinstance(node.value, ast.Name):
+                return False
+            if node.value.id == "point" and node.attr not in point_attr_names:
+                return False
+            if node.value.id not in ("point", "np"):
+                return False
+            continue
+        if isinstance(node, ast.Call):
+            if node.keywords:
+                return False
+            func = node.func
+            if isinstance(func, ast.Name) and func.id in VECTORIZABLE_FUNCTION_NAMES:
+                continue
+            if isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name) and func.value.id == "np":
+                numpy_func = getattr(np, func.attr, None)
+                if isinstance(numpy_func, np.ufunc) or func.attr in VECTORIZABLE_NUMPY_FUNCTION_NAMES:
+                    continue
+            return False
+        return False
+    return True
+
+def run_vectorized_kernel(kernel, bindings, input_data, input_point_count):
+    # Single value attributes are exposed as (points x 1) columns,
+    # so that they broadcast against vector attributes.
+    points = Points()
+    for binding in bindings:
+        value = np.array(input_data[binding.property_name])
+        setattr(points, binding.variable_name, value.reshape(input_point_count, -1))
+    points.ptnum = np.arange(input_point_count).reshape(input_point_count, 1)
+    kernel(point=points, elemnum=points.ptnum)
+    output_data = {}
+    for binding in bindings:
+        input_shape = input_data[binding.property_name].shape
+        value = np.broadcast_to(getattr(points, binding.variable_name),
+                                (input_point_count, int(np.prod(input_shape[1:]))))
+        output_data[binding.property_name] = value.reshape(input_shape)
+    return output_data
+
+def create_kernel_utils(point_add_buffer):
+    def create_point():
+        return point_add_buffer.view(point_add_buffer.add())
+    def copy_point(source_point):
+        ptnum = point_add_buffer.add()
+        for name, column in point_add_buffer.columns.items():
+            column[ptnum] = source_point.buffer.columns[name][source_point.ptnum]
+        return point_add_buffer.view(ptnum)
+    def remove_point(point):
+        point.buffer.removed[point.ptnum] = True
+    return dict(create_point=create_point, copy_point=copy_point, remove_point=remove_point)
+
+def run_kernel_chunk(kernel, point_buffer, start, end):
+    # Per point execution over a slice of the buffer, the point view
+    # reads/writes the buffer columns directly.
+    point = point_buffer.view(start)
+    for elemnum in range(start, end):
+        point.ptnum = elemnum
+        # User Kernel Start
+        kernel(point=point, elemnum=elemnum)
+        # User Kernel End
+
+# Kernels on large point counts are run in a process pool. The arrays are shared
+# via shared memory, so only the kernel source and the chunk range get pickled.
+KERNEL_WORKER_COUNT = os.cpu_count() or 1
+KERNEL_PARALLEL_MIN_POINT_COUNT = 250000
+# The python interpreter used to spawn the workers. In Houdini (husk/hython)
+# 'sys.executable' is not a plain python interpreter, so this has to be set
+# to the python interpreter shipped with Houdini, otherwise the pool is disabled.
+KERNEL_PYTHON_EXECUTABLE = None
+KERNEL_POOL = None
+
+def get_kernel_python_executable():
+    if KERNEL_PYTHON_EXECUTABLE:
+        return KERNEL_PYTHON_EXECUTABLE
+    if "hou" in sys.modules or not os.path.basename(sys.executable or "").lower().startswith("python"):
+        return None
+    return sys.executable
+
+def get_kernel_pool():
+    """Get the process pool.
+    Returns:
+        ProcessPoolExecutor|None: The pool, None if no python interpreter is available to spawn the workers.
+    """
+    global KERNEL_POOL
+    if KERNEL_POOL is None:
+        executable = get_kernel_python_executable()
+        if not executable:
+            return None
+        # We don't fork, as the parent process (e.g. husk) may hold threads and locks.
+        mp_context = multiprocessing.get_context("spawn")
+        mp_context.set_executable(executable)
+        KERNEL_POOL = ProcessPoolExecutor(max_workers=KERNEL_WORKER_COUNT, mp_context=mp_context)
+    return KERNEL_POOL
+
+def run_kernel_chunk_worker(source, frame, shared_arrays, start, end, point_count):
+    """Run a kernel on a chunk of shared memory arrays.
+    The stage and prim are not available in the worker processes,
+    kernels that use them are not run in parallel (see Kernel.parallelizable).
+    Args:
+        source (tuple): The kernel mode, module code, execute code and bindings.
+        frame (float): The frame.
+        shared_arrays (dict): The property name to (shared memory name, dtype, shape) mapping.
+        start (int): The chunk start ptnum.
+        end (int): The chunk end ptnum.
+        point_count (int): The input point count.
+    Returns:
+        tuple(np.ndarray, dict): The removed ptnums and the property name to added points array mapping.
+    """
+    compiled_kernel = get_kernel_from_source(source)
+    shms = []
+    columns = {}
+    kernel_globals = {"pxr": pxr, "np": np, "Point": Point, "Points": Points,
+                      "stage": None, "prim": None, "frame": frame, "npoints": lambda: point_count}
+    for property_name, (shm_name, dtype, shape) in shared_arrays.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        shms.append(shm)
+        columns[property_name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    try:
+        point_buffer = PointBuffer(compiled_kernel.bindings, columns)
+        point_add_buffer = PointBuffer.empty_like(point_buffer)
+        kernel_globals.update(create_kernel_utils(point_add_buffer))
+        kernel = compiled_kernel.instantiate(kernel_globals)
+        run_kernel_chunk(kernel, point_buffer, start, end)
+        points_remove = np.flatnonzero(point_buffer.removed)
+    finally:
+        # Release all views onto the shared memory before closing it.
+        columns.clear()
+        kernel_globals.clear()
+        point_buffer = None
+        for shm in shms:
+            shm.close()
+    return points_remove, point_add_buffer.compact()
+
+def run_kernel_parallel(compiled_kernel, frame, input_data, input_point_count):
+    """Run a kernel in a process pool on chunks of the input arrays.
+    The results are merged in ptnum order, so the output matches the serial execution.
+    Returns:
+        dict: The property name to output array mapping.
+    """
+    shms = {}
+    shared_arrays = {}
+    try:
+        for property_name, array in input_data.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            shms[property_name] = shm
+            np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+            shared_arrays[property_name] = (shm.name, array.dtype.str, array.shape)
+        chunk_size = max(KERNEL_CHUNK_SIZE // 4, -(-input_point_count // (KERNEL_WORKER_COUNT * 4)))
+        futures = []
+        pool = get_kernel_pool()
+        for chunk_start in range(0, input_point_count, chunk_size):
+            chunk_end = min(chunk_start + chunk_size, input_point_count)
+            futures.append(pool.submit(run_kernel_chunk_worker, compiled_kernel.source, frame,
+                                       shared_arrays, chunk_start, chunk_end, input_point_count))
+        keep_mask = np.ones(input_point_count, dtype=bool)
+        output_data = {property_name: [] for property_name in input_data}
+        for future in futures:
+            chunk_points_remove, chunk_points_add_data = future.result()
+            keep_mask[chunk_points_remove] = False
+            for property_name, value in chunk_points_add_data.items():
+                output_data[property_name].append(value)
+        for property_name, array in input_data.items():
+            array = np.ndarray(array.shape, dtype=array.dtype, buffer=shms[property_name].buf)
+            output_data[property_name] = np.concatenate([array[keep_mask]] + output_data[property_name])
+    finally:
+        for shm in shms.values():
+            shm.close()
+            shm.unlink()
+    return output_data
+
 def run_kernel(stage, frame):
     # Process
     for prim in stage.Traverse():
@@ -36,23 +442,13 @@ def run_kernel(stage, frame):
         if not attr.HasValue():
             continue
 
-        mode = prim.GetAttribute(Tokens.mode).Get(frame)
-        module_code = prim.GetAttribute(Tokens.module_code).Get(frame)
-        execute_code = prim.GetAttribute(Tokens.execute_code).Get(frame)
-        bindings_serialized = eval(prim.GetAttribute(Tokens.bindings).Get(frame))
-        
-        # Bindings
-        bindings = []
-        for binding_dict in bindings_serialized:
-            binding = Binding()
-            binding.property_name = binding_dict["property_name"]
-            binding.variable_name = binding_dict["variable_name"]
-            binding.value_type_name = binding_dict["value_type_name"]
-            bindings.append(binding)
         # Kernel
-        module_code_compiled = compile(module_code, "module_code", "exec")
-        execute_code_compiled = compile(execute_code, "code", "exec")
-        exec(module_code_compiled)
+        compiled_kernel = get_kernel(prim, frame)
+        mode = compiled_kernel.mode
+        bindings = compiled_kernel.bindings
+        kernel_globals = {"pxr": pxr, "np": np, "Point": Point, "Points": Points,
+                          "stage": stage, "prim": prim, "frame": frame}
+        kernel = compiled_kernel.instantiate(kernel_globals)
         # Read data
         input_data = {}
         input_point_count = -1
@@ -62,7 +458,7 @@ def run_kernel(stage, frame):
         for binding in bindings:
             # Read attribute or create default fallback value
             attr = prim.GetAttribute(binding.property_name)
-            if not attr:   
+            if not attr:
                 value_type_name_str = binding.fallback_value_type_name if binding.value_type_name == "automatic" else binding.value_type_name
                 value_type_name = getattr(pxr.Sdf.ValueTypeNames, value_type_name_str)
                 attr = prim.CreateAttribute(binding.property_name, value_type_name)
@@ -79,51 +475,41 @@ def run_kernel(stage, frame):
         # Utils
         def npoints():
             return input_point_count
+        kernel_globals["npoints"] = npoints
         # Modes
+        if mode == "kernel" and compiled_kernel.vectorizable:
+            # Kernels without per point logic run in "array" mode automatically.
+            try:
+                output_data = run_vectorized_kernel(kernel, bindings, input_data, input_point_count)
+                mode = "vectorized"
+            except ValueError:
+                pass
         if mode == "kernel":
-            # Kernel Utils
-            points_add = []
-            points_remove = set()
-            def create_point():
-                point = Point(bindings)
-                points_add.append(point)
-            def copy_point(source_point):
-                point = Point(source_point.bindings)
-                for binding in point.bindings:
-                    setattr(point, binding.variable_name, np.copy(getattr(source_point, binding.variable_name)))
-                points_add.append(point)
-                return point
-            def remove_point(point):
-                points_remove.add(point.ptnum)
-            # Kernel
-            point = Point(bindings)
-            for elemnum in range(len(list(input_data.values())[0])):
-                point.ptnum = elemnum
-                for binding in bindings:
-                    setattr(point, binding.variable_name, input_data[binding.property_name][elemnum])
-                # User Kernel Start
-                exec(execute_code_compiled)
-                # User Kernel End
-                if points_remove and point.ptnum in points_remove:
-                    continue
-                for binding in bindings:
-                    output_data[binding.property_name].append(getattr(point, binding.variable_name))
-            for binding in bindings:
-                for point_add in points_add:
-                    output_data[binding.property_name].append(getattr(point_add, binding.variable_name))
-            for binding in bindings:
-                output_data[binding.property_name] = np.array(output_data[binding.property_name])
-                output_point_count = max(output_point_count, len(output_data[binding.property_name]))
+            if (input_point_count >= KERNEL_PARALLEL_MIN_POINT_COUNT and KERNEL_WORKER_COUNT > 1
+                    and compiled_kernel.parallelizable and get_kernel_pool()):
+                output_data = run_kernel_parallel(compiled_kernel, frame, input_data, input_point_count)
+            else:
+                point_buffer = PointBuffer(bindings, input_data)
+                point_add_buffer = PointBuffer.empty_like(point_buffer)
+                kernel_globals.update(create_kernel_utils(point_add_buffer))
+                for chunk_start in range(0, max(input_point_count, 0), KERNEL_CHUNK_SIZE):
+                    run_kernel_chunk(kernel, point_buffer, chunk_start,
+                                     min(chunk_start + KERNEL_CHUNK_SIZE, input_point_count))
+                output_data = point_buffer.compact()
+                for property_name, value in point_add_buffer.compact().items():
+                    if len(value):
+                        output_data[property_name] = np.concatenate([output_data[property_name], value])
         elif mode == "array":
             points = Points()
             for binding in bindings:
                 setattr(points, binding.variable_name, input_data[binding.property_name])
             # User Kernel Start
-            exec(execute_code_compiled)
+            kernel(points=points)
             # User Kernel End
             for binding in bindings:
                 output_data[binding.property_name] = getattr(points, binding.variable_name)
-                output_point_count = max(output_point_count, len(output_data[binding.property_name]))
+        for binding in bindings:
+            output_point_count = max(output_point_count, len(output_data[binding.property_name]))
         # If the output is invalid, block it to prevent segfaults
         if input_point_count != output_point_count:
             for attr in prim.GetAttributes():